@@ -1,11 +1,16 @@
+import os
 import re
 import json
 import time
 import hashlib
+import threading
 
-from urllib.parse import urlparse, urljoin, urldefrag
-from bs4 import BeautifulSoup
-from collections import Counter, defaultdict
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import urlparse, urljoin
+import lxml.html
+from collections import Counter, defaultdict, namedtuple
 
 
 ALLOWED_HOST_SUFFIXES = (
@@ -14,10 +19,15 @@ ALLOWED_HOST_SUFFIXES = (
     "informatics.uci.edu",
     "stat.uci.edu",
 )
+# subdomains only: a bare "ics.uci.edu" suffix would also accept "evilics.uci.edu"
+_DOTTED_HOST_SUFFIXES = tuple("." + domain for domain in ALLOWED_HOST_SUFFIXES)
 ALLOWED_SCHEMES = {"http", "https"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
 
-# Report VAR
-SEEN_URLS = set()
+# Report VAR, guarded by _STATS_LOCK since scraper may run on several threads
+_STATS_LOCK = threading.Lock()
+_SAVE_LOCK = threading.Lock()  # serializes writes of STATS_PATH
+SEEN_URL_HASHES = set()
 PAGE_WORDCOUNT = {}
 # Longest page info
 LONGEST_PAGE_URL = None
@@ -25,13 +35,64 @@ LONGEST_PAGE_WORDS = 0
 GLOBAL_WORD_FREQ = Counter()
 SUBDOMAIN_PAGECOUNT = defaultdict(int)
 
-# Tokenizer
-WORD_RE = re.compile(r"[a-z0-9]+")
+# HTML parsing, lxml parsers should not be shared between threads
+_THREAD_PARSERS = threading.local()
+# Tokenizer: maps every byte outside [a-z0-9] to a space
+_TOK_TABLE = bytes(c if (48 <= c <= 57 or 97 <= c <= 122) else 32 for c in range(256))
+_SHORT_TOKENS = "0123456789abcdefghijklmnopqrstuvwxyz"
+_ASCII_LETTERS = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]+")
+# URL filters
+_BAD_EXTS = (
+    ".css", ".js", ".bmp", ".gif", ".jpg", ".jpeg", ".ico", ".webp",
+    ".png", ".tif", ".tiff", ".mid", ".mp2", ".mp3", ".mp4", ".webm",
+    ".wav", ".avi", ".mov", ".mpeg", ".mpg", ".ram", ".m4v", ".mkv", ".ogg", ".ogv", ".pdf",
+    ".ps", ".eps", ".tex", ".ppt", ".pptx", ".pps", ".ppsx", ".doc", ".docx", ".xls", ".xlsx",
+    ".names",
+    ".data", ".dat", ".exe", ".bz2", ".tar", ".msi", ".bin", ".7z", ".psd", ".dmg", ".iso",
+    ".epub", ".dll", ".cnf", ".tgz", ".sha1",
+    ".thmx", ".mso", ".arff", ".rtf", ".jar", ".csv",
+    ".rm", ".smil", ".wmv", ".swf", ".wma", ".zip", ".rar", ".gz",
+)
+_MULTI_SLASH_RE = re.compile(r"/{2,}")
+_HEX_CHARS = frozenset("0123456789abcdefABCDEF")
+# Trap substrings, each matched in a single scan of the path / query.
+# "/events/" already covers the tag/day/week/month/list calendar views.
+_PATH_TRAPS = (
+    "/events/",
+    "/event/",
+    "/lib/exe/fetch.php",
+)
+_QUERY_TRAPS = (
+    "action=diff",
+    "format=txt",
+    "precision=second",
+    "version=",
+    "timeline",
+    "from=",
+    "ical=1",
+    "tribe_",
+    "tribe-bar-date",
+)
+_PATH_TRAP_RE = re.compile("|".join(
+    [re.escape(t) for t in _PATH_TRAPS]
+    + [
+        r"^/doku\.php",  # DokuWiki
+        r"/wp-login\.php\Z",  # login pages
+        r"/\d{4}-\d{2}$",  # month archives
+    ]
+))
+_QUERY_TRAP_RE = re.compile("|".join(map(re.escape, _QUERY_TRAPS)))
 # Lightweight trap avoidance
 PATH_FAMILY_COUNT = Counter()
 CONTENT_HASHES = set()
 
 STATS_PATH = "crawl_stats.json"
+# Append-only logs for the stats that grow with every page
+SEEN_LOG_PATH = "crawl_seen.bin"
+HASHES_LOG_PATH = "crawl_hashes.bin"
+PAGE_WC_LOG_PATH = "crawl_pagewc.jsonl"
+_LOG_FILES = {}
 
 STOP_WORDS = {
     "a", "about", "above", "after", "again", "against", "all", "am", "an", "and", "any", "are",
@@ -63,14 +124,18 @@ STOP_WORDS = {
 
 def _load_stats():
     """Load persisted stats if present"""
-    global SEEN_URLS, PAGE_WORDCOUNT, LONGEST_PAGE_URL, LONGEST_PAGE_WORDS
+    global SEEN_URL_HASHES, PAGE_WORDCOUNT, LONGEST_PAGE_URL, LONGEST_PAGE_WORDS
     global GLOBAL_WORD_FREQ, SUBDOMAIN_PAGECOUNT, PATH_FAMILY_COUNT, CONTENT_HASHES
 
+    legacy = False
     try:
         with open(STATS_PATH, "r", encoding = "utf-8") as f:
             data = json.load(f)
 
-        SEEN_URLS = set(data.get("seen_urls", []))
+        # stats files written before the append-only logs hold these three inline
+        legacy = any(k in data for k in ("seen_urls", "page_wordcount", "content_hashes"))
+        SEEN_URL_HASHES = {_fingerprint(u.encode("utf-8", errors = "ignore"))
+                           for u in data.get("seen_urls", [])}
         PAGE_WORDCOUNT = {k: int(v) for k, v in data.get("page_wordcount", {}).items()}
         LONGEST_PAGE_URL = data.get("longest_page_url")
         LONGEST_PAGE_WORDS = int(data.get("longest_page_words", 0))
@@ -79,41 +144,150 @@ def _load_stats():
         SUBDOMAIN_PAGECOUNT = defaultdict(int, {k: int(v) for k, v in
                                                 data.get("subdomain_pagecount", {}).items()})
         PATH_FAMILY_COUNT = Counter(data.get("path_family_count", {}))
-        CONTENT_HASHES = set(data.get("content_hashes", []))
+        # older stats files hold sha1 hex digests; keep their leading 64 bits
+        CONTENT_HASHES = {int(h[:16], 16) if isinstance(h, str) else int(h)
+                          for h in data.get("content_hashes", [])}
 
     except FileNotFoundError:
-        return
+        pass
+    except Exception:
+        pass
+
+    try:
+        SEEN_URL_HASHES.update(_read_fingerprints(SEEN_LOG_PATH))
+        CONTENT_HASHES.update(_read_fingerprints(HASHES_LOG_PATH))
+        PAGE_WORDCOUNT.update(_read_log(PAGE_WC_LOG_PATH))
+        if legacy:
+            _compact_logs()
+    except Exception:
+        pass
+
+
+def _read_log(path):
+    """Load the [url, wc] records of the page word count log"""
+    records = []
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return records
+
+    good_end = 0
+    for line in data.splitlines(keepends = True):
+        if not line.endswith(b"\n"):
+            # partial last line from an interrupted write
+            break
+        good_end += len(line)
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if (isinstance(record, list) and len(record) == 2
+                and isinstance(record[0], str) and isinstance(record[1], int)):
+            records.append(record)
+    if good_end != len(data):
+        # cut the partial line off the file too, or the next append would be glued onto it
+        try:
+            os.truncate(path, good_end)
+        except OSError:
+            pass
+    return records
+
+
+def _append_log(path, record):
+    """Append one record to a stats log, the handle stays open for the whole crawl"""
+    try:
+        f = _LOG_FILES.get(path)
+        if f is None:
+            f = _LOG_FILES[path] = open(path, "a", encoding = "utf-8")
+        f.write(json.dumps(record, ensure_ascii = False) + "\n")
+        f.flush()
+    except Exception:
+        pass
+
+
+def _read_fingerprints(path):
+    """Load a log of packed 64-bit fingerprints"""
+    prints = array("Q")
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return prints
+    whole = len(data) - len(data) % prints.itemsize
+    if whole != len(data):
+        # cut a partial last record from an interrupted write off the file too,
+        # or the next append would leave every later record misaligned
+        try:
+            os.truncate(path, whole)
+        except OSError:
+            pass
+    prints.frombytes(data[:whole])
+    return prints
+
+
+def _append_fingerprint(path, value):
+    """Append one 64-bit fingerprint to a packed log"""
+    try:
+        f = _LOG_FILES.get(path)
+        if f is None:
+            f = _LOG_FILES[path] = open(path, "ab")
+        array("Q", (value,)).tofile(f)
+        f.flush()
     except Exception:
-        return
+        pass
+
+
+def _compact_logs():
+    """Rewrite the stats logs from the in-memory state"""
+    for path, records in ((SEEN_LOG_PATH, SEEN_URL_HASHES),
+                          (HASHES_LOG_PATH, CONTENT_HASHES),
+                          (PAGE_WC_LOG_PATH, PAGE_WORDCOUNT.items())):
+        try:
+            f = _LOG_FILES.pop(path, None)
+            if f is not None:
+                f.close()
+            if isinstance(records, set):
+                with open(path + ".tmp", "wb") as f:
+                    array("Q", records).tofile(f)
+            else:
+                with open(path + ".tmp", "w", encoding = "utf-8") as f:
+                    for record in records:
+                        f.write(json.dumps(record, ensure_ascii = False) + "\n")
+            os.replace(path + ".tmp", path)
+        except Exception:
+            pass
 
 
 def _save_stats(throttle_seconds = 2.0):
     """Persist stats"""
-    now = time.time()
-    last = getattr(_save_stats, "_last_save_ts", 0.0)
-    if now - last < throttle_seconds:
-        return
-    _save_stats._last_save_ts = now
-
-    data = {
-        "seen_urls": sorted(SEEN_URLS),
-        "page_wordcount": PAGE_WORDCOUNT,
-        "longest_page_url": LONGEST_PAGE_URL,
-        "longest_page_words": LONGEST_PAGE_WORDS,
-        "global_word_freq": dict(GLOBAL_WORD_FREQ),
-        "subdomain_pagecount": dict(SUBDOMAIN_PAGECOUNT),
-        "path_family_count": dict(PATH_FAMILY_COUNT),
-        "content_hashes": sorted(CONTENT_HASHES),
-    }
+    with _STATS_LOCK:
+        now = time.time()
+        last = getattr(_save_stats, "_last_save_ts", 0.0)
+        if now - last < throttle_seconds:
+            return
+        _save_stats._last_save_ts = now
+
+        # SEEN_URL_HASHES, CONTENT_HASHES and PAGE_WORDCOUNT are appended to their logs
+        # as they grow, see _append_fingerprint / _append_log
+        data = {
+            "longest_page_url": LONGEST_PAGE_URL,
+            "longest_page_words": LONGEST_PAGE_WORDS,
+            "global_word_freq": dict(GLOBAL_WORD_FREQ),
+            "subdomain_pagecount": dict(SUBDOMAIN_PAGECOUNT),
+            "path_family_count": dict(PATH_FAMILY_COUNT),
+        }
     try:
-        with open(STATS_PATH, "w", encoding = "utf-8") as f:
+        with _SAVE_LOCK, open(STATS_PATH, "w", encoding = "utf-8") as f:
             json.dump(data, f, ensure_ascii = False, indent = 2)
     except Exception:
         pass
 
 
 def scraper(url, resp):
-    links = extract_next_links(url, resp)
+    # one tree serves both link extraction and, after junk removal, the text analytics
+    doc = _parse_response(resp)
+    links = extract_next_links(url, resp, doc)
     valid_links = [link for link in links if is_valid(link)]
 
     try:
@@ -139,53 +313,59 @@ def scraper(url, resp):
         if standard_url is None:
             return valid_links
 
-        if standard_url in SEEN_URLS:
-            return valid_links
-        SEEN_URLS.add(standard_url)
+        url_hash = _fingerprint(standard_url.encode("utf-8", errors = "ignore"))
+        with _STATS_LOCK:
+            if url_hash in SEEN_URL_HASHES:
+                return valid_links
+            SEEN_URL_HASHES.add(url_hash)
+            _append_fingerprint(SEEN_LOG_PATH, url_hash)
 
-        soup = BeautifulSoup(content, "lxml")
-        _remove_junk_tags(soup)
-        text = soup.get_text(separator = " ", strip = True)
-        tokens = _tokenize(text)
+        if doc is None:
+            return valid_links
+        _remove_junk_tags(doc)
+        text = " ".join(s for s in map(str.strip, doc.itertext()) if s)
+        token_counts = _count_tokens(text)
+        wc = sum(token_counts.values())
 
-        if len(tokens) < 100:
+        if wc < 100:
             _save_stats()
             return valid_links
 
-        wc = len(tokens)
-
         if wc > 200000:
             return valid_links
 
-        alpha_chars = sum(c.isalpha() for c in text)
+        alpha_chars = _alpha_count(text)
         alpha_ratio = alpha_chars / max(len(text), 1)
         if alpha_ratio < 0.6:
             return valid_links
 
-        text_hash = hashlib.sha1(text.encode("utf-8", errors = "ignore")).hexdigest()
-        if text_hash in CONTENT_HASHES:
-            _save_stats()
-            return valid_links
-        CONTENT_HASHES.add(text_hash)
+        text_hash = _fingerprint(text.encode("utf-8", errors = "ignore"))
 
-        wc = len(tokens)
-        PAGE_WORDCOUNT[standard_url] = wc
-        global LONGEST_PAGE_URL, LONGEST_PAGE_WORDS
-        if wc > LONGEST_PAGE_WORDS:
-            LONGEST_PAGE_WORDS = wc
-            LONGEST_PAGE_URL = standard_url
-
-        for w in tokens:
-            if w in STOP_WORDS:
-                continue
-            if not any(ch.isalpha() for ch in w):
-                continue
-            GLOBAL_WORD_FREQ[w] += 1
+        # filter per distinct word rather than per token occurrence;
+        # tokens are [a-z0-9]+, so "has a letter" is simply "not all digits"
+        word_counts = {w: n for w, n in token_counts.items()
+                       if w not in STOP_WORDS and not w.isdigit()}
 
-        parsed = urlparse(standard_url)
+        parsed = _cached_urlparse(standard_url)
         host = (parsed.hostname or "").lower()
-        if host.endswith("uci.edu"):
-            SUBDOMAIN_PAGECOUNT[host] += 1
+
+        with _STATS_LOCK:
+            duplicate = text_hash in CONTENT_HASHES
+            if not duplicate:
+                CONTENT_HASHES.add(text_hash)
+                _append_fingerprint(HASHES_LOG_PATH, text_hash)
+
+                PAGE_WORDCOUNT[standard_url] = wc
+                _append_log(PAGE_WC_LOG_PATH, [standard_url, wc])
+                global LONGEST_PAGE_URL, LONGEST_PAGE_WORDS
+                if wc > LONGEST_PAGE_WORDS:
+                    LONGEST_PAGE_WORDS = wc
+                    LONGEST_PAGE_URL = standard_url
+
+                GLOBAL_WORD_FREQ.update(word_counts)
+
+                if host.endswith("uci.edu"):
+                    SUBDOMAIN_PAGECOUNT[host] += 1
 
         _save_stats()
 
@@ -195,10 +375,13 @@ def scraper(url, resp):
     return valid_links
 
 
-_load_stats()
+def scraper_batch(items):
+    """Run scraper over (url, resp) pairs on a thread pool, lxml parses without the GIL"""
+    with ThreadPoolExecutor(max_workers = os.cpu_count()) as ex:
+        return list(ex.map(lambda item: scraper(*item), items))
 
 
-def extract_next_links(url, resp):
+def extract_next_links(url, resp, doc = None):
     # Implementation required.
     # url: the URL that was used to get the page
     # resp.url: the actual url of the page
@@ -210,6 +393,7 @@ def extract_next_links(url, resp):
     # Return a list with the hyperlinks (as strings) scrapped from resp.raw_response.content
 
     links = []
+    seen = set()
     try:
         if resp is None or getattr(resp, "status", None) != 200:
             return links
@@ -224,31 +408,78 @@ def extract_next_links(url, resp):
 
         base_url = getattr(resp, "url", None) or getattr(raw, "url", None) or url
 
-        soup = BeautifulSoup(content, "lxml")
+        if doc is None:
+            doc = _parse_html(content)
 
-        for a in soup.find_all("a", href = True):
+        for a in doc.iter("a"):
             href = a.get("href")
             if not href:
                 continue
 
-            abs_url = urljoin(base_url, href)
-            abs_url = urldefrag(abs_url)[0]
+            # drop the fragment here so page#top, page#main, ... share one _standard_url cache entry
+            abs_url = urljoin(base_url, href).partition("#")[0]
 
             std_url = _standard_url(abs_url)
-            if std_url:
+            if std_url and std_url not in seen:
+                seen.add(std_url)
                 links.append(std_url)
 
     except Exception:
         return []
 
-    return list(dict.fromkeys(links))
+    return links
+
+
+@lru_cache(maxsize = 8192)
+def _cached_urlparse(u: str):
+    """urlparse memoized, the same url is parsed by several filters"""
+    return urlparse(u)
+
+
+_UrlParts = namedtuple("_UrlParts", "scheme hostname port path query")
 
 
+def _fast_split(u: str):
+    """urlparse for plain http(s) urls, anything unusual goes through urlparse itself"""
+    scheme_end = u.find("://")
+    if scheme_end not in (4, 5) or ";" in u or not (u.isascii() and u.isprintable()):
+        return urlparse(u)
+    scheme = u[:scheme_end]
+    if scheme != "http" and scheme != "https":
+        return urlparse(u)
+
+    u = u.partition("#")[0]
+    host_start = scheme_end + 3
+    host_end = len(u)
+    for sep in "/?":
+        i = u.find(sep, host_start)
+        if i != -1 and i < host_end:
+            host_end = i
+    netloc = u[host_start:host_end]
+    # userinfo, ipv6 literals and zone ids need urlparse's handling
+    if "@" in netloc or "[" in netloc or "]" in netloc or "%" in netloc:
+        return urlparse(u)
+
+    host, _, port = netloc.partition(":")
+    if port:
+        # same checks and errors as SplitResult.port
+        if not port.isdigit():
+            raise ValueError(f"Port could not be cast to integer value as {port!r}")
+        port = int(port)
+        if not 0 <= port <= 65535:
+            raise ValueError("Port out of range 0-65535")
+    else:
+        port = None
+
+    path, _, query = u[host_end:].partition("?")
+    return _UrlParts(scheme, host.lower() or None, port, path, query)
+
+
+@lru_cache(maxsize = 16384)
 def _standard_url(u: str):
     """make sure the url satisfy a standard"""
     try:
-        u = urldefrag(u)[0]
-        parsed = urlparse(u)
+        parsed = _fast_split(u)
 
         if parsed.scheme not in ALLOWED_SCHEMES:
             return None
@@ -258,15 +489,14 @@ def _standard_url(u: str):
             return None
 
         # remove default ports
+        port = parsed.port
         netloc = host
-        if parsed.port:
-            if (parsed.scheme == "http" and parsed.port != 80) or (
-                    parsed.scheme == "https" and parsed.port != 443):
-                netloc = f"{host}:{parsed.port}"
+        if port and port != _DEFAULT_PORTS.get(parsed.scheme):
+            netloc = f"{host}:{port}"
 
         path = parsed.path or "/"
         # normalize multiple slashes
-        path = re.sub(r"/{2,}", "/", path)
+        path = _MULTI_SLASH_RE.sub("/", path)
 
         if path != "/" and path.endswith("/"):
             path = path[:-1]
@@ -288,7 +518,7 @@ def is_valid(url):
     # There are already some conditions that return False.
 
     try:
-        parsed = urlparse(url)
+        parsed = _cached_urlparse(url)
 
         # 1. Scheme Check: Only allow http and https [cite: 78]
         if parsed.scheme not in ALLOWED_SCHEMES:
@@ -297,64 +527,26 @@ def is_valid(url):
         # 2. Domain Check: Must be within the specified UCI domains [cite: 17, 53, 121]
         # host is retrieved via parsed.hostname
         host = (parsed.hostname or "").lower()
-        if not any(
-                host == domain or host.endswith("." + domain) for domain in ALLOWED_HOST_SUFFIXES):
+        if host not in ALLOWED_HOST_SUFFIXES and not host.endswith(_DOTTED_HOST_SUFFIXES):
             return False
 
         # 3. Extension Filtering: Avoid non-text or large files
-        # This regex filters out images, archives, and multimedia to save bandwidth.
-        if re.match(
-                r".*\.(css|js|bmp|gif|jpe?g|ico|webp"
-                + r"|png|tiff?|mid|mp2|mp3|mp4|webm"
-                + r"|wav|avi|mov|mpeg|mpg|ram|m4v|mkv|ogg|ogv|pdf"
-                + r"|ps|eps|tex|ppt|pptx|pps|ppsx|doc|docx|xls|xlsx|names"
-                + r"|data|dat|exe|bz2|tar|msi|bin|7z|psd|dmg|iso"
-                + r"|epub|dll|cnf|tgz|sha1"
-                + r"|thmx|mso|arff|rtf|jar|csv"
-                + r"|rm|smil|wmv|swf|wma|zip|rar|gz)$", parsed.path.lower()):
-            return False
-
+        # This filters out images, archives, and multimedia to save bandwidth.
         path = parsed.path.lower()
-        query = (parsed.query or "").lower()
-
-        if any(k in query for k in [
-            "action=diff",
-            "format=txt",
-            "precision=second",
-            "version=",
-            "timeline",
-            "from="
-        ]):
-            return False
-
-        if "/events/" in path:
-            return False
-
-        if "/event/" in path:
-            return False
-
-        if re.search(r"/\d{4}-\d{2}$", path):
+        if path.endswith(_BAD_EXTS):
             return False
 
-        # 4) Events/calendar traps (minimal)
-        if "/events/tag/" in path or "/events/day/" in path:
-            return False
-        if "/events/week" in path or "/events/month" in path or "/events/list" in path:
-            return False
-        if "ical=1" in query or "tribe_" in query or "tribe-bar-date" in query:
-            return False
+        query = (parsed.query or "").lower()
 
-        # 5) DokuWiki trap
-        if path.startswith("/doku.php"):
-            return False
-        if "/lib/exe/fetch.php" in path:
+        # 4) Wiki revision / calendar query traps
+        if query and _QUERY_TRAP_RE.search(query):
             return False
 
-        # 6) Login pages
-        if path.endswith("/wp-login.php"):
+        # 5) Events, DokuWiki, date-archive and login path traps
+        if _PATH_TRAP_RE.search(path):
             return False
 
-        # 7) Basic depth / repetition
+        # 6) Basic depth / repetition
         segments = [s for s in path.split("/") if s]
         if len(segments) > 12:
             return False
@@ -368,16 +560,71 @@ def is_valid(url):
         return False
 
 
-def _remove_junk_tags(soup: BeautifulSoup):
+def _parse_response(resp):
+    """Parse the page of a 200 response, None when there is nothing to parse"""
+    try:
+        if resp is None or getattr(resp, "status", None) != 200:
+            return None
+        content = getattr(getattr(resp, "raw_response", None), "content", None)
+        if not content:
+            return None
+        return _parse_html(content)
+    except Exception:
+        return None
+
+
+def _parse_html(content):
+    """Parse page bytes with lxml, preferring utf-8 when the bytes decode as such."""
+    if isinstance(content, bytes):
+        try:
+            content.decode("utf-8")
+        except UnicodeDecodeError:
+            return lxml.html.fromstring(content)
+        return lxml.html.fromstring(content, parser = _get_parser("utf-8"))
+    return lxml.html.fromstring(content, parser = _get_parser())
+
+
+def _get_parser(encoding = None):
+    """This thread's lxml html parser for the given encoding"""
+    key = encoding or "default"
+    parser = getattr(_THREAD_PARSERS, key, None)
+    if parser is None:
+        parser = lxml.html.HTMLParser(encoding = encoding)
+        setattr(_THREAD_PARSERS, key, parser)
+    return parser
+
+
+def _remove_junk_tags(doc: lxml.html.HtmlElement):
     """Remove tags that are not useful for text analytics."""
-    for tag in soup(["script", "style", "noscript", "header", "footer", "nav", "aside", "form"]):
-        tag.decompose()
+    for tag in list(doc.iter("script", "style", "noscript", "header", "footer", "nav", "aside",
+                             "form")):
+        tag.clear(keep_tail = True)
+
+
+def _fingerprint(data: bytes):
+    """64-bit fingerprint of a url or page, kept as an int to keep the dedup sets small."""
+    return int.from_bytes(hashlib.sha1(data).digest()[:8], "big")
 
 
-def _tokenize(text: str):
-    """Tokenize visible text into lowercase words/numbers."""
-    text = text.lower()
-    return [t for t in WORD_RE.findall(text) if len(t) >= 2]
+def _alpha_count(text: str):
+    """Number of alphabetic chars in text, same as sum(c.isalpha() for c in text)."""
+    ascii_bytes = text.encode("ascii", errors = "ignore")
+    # ascii letters are counted by deleting them in one bytes.translate pass
+    count = len(ascii_bytes) - len(ascii_bytes.translate(None, _ASCII_LETTERS))
+    if len(ascii_bytes) != len(text):
+        count += sum(c.isalpha() for run in _NON_ASCII_RE.findall(text) for c in run)
+    return count
+
+
+def _count_tokens(text: str):
+    """Count lowercase words/numbers of at least two chars in visible text."""
+    # non-ascii chars become "?" and then separators, same as the old [a-z0-9]+ regex
+    buf = text.lower().encode("ascii", errors = "replace").translate(_TOK_TABLE)
+    counts = Counter(buf.decode("ascii").split())
+    # single-char tokens can only be one of these, so drop them by key
+    for ch in _SHORT_TOKENS:
+        counts.pop(ch, None)
+    return counts
 
 
 def _has_repeated_segments(segments):
@@ -402,9 +649,9 @@ def _path_signature(host, path, query_dict):
     segs = [s for s in path.split("/") if s]
     norm_segs = []
     for s in segs[:10]:
-        if re.fullmatch(r"\d+", s):
+        if s.isdecimal():
             norm_segs.append("{num}")
-        elif re.fullmatch(r"[0-9a-f]{8,}", s, flags = re.IGNORECASE):
+        elif len(s) >= 8 and _HEX_CHARS.issuperset(s):
             norm_segs.append("{hex}")
         else:
             norm_segs.append(s.lower())
@@ -412,3 +659,7 @@ def _path_signature(host, path, query_dict):
     qkeys = sorted(k.lower() for k in query_dict.keys())[:8]
 
     return host + "/" + "/".join(norm_segs) + "?" + "&".join(qkeys)
+
+
+# runs last: _load_stats needs the helpers defined below scraper()
+_load_stats()